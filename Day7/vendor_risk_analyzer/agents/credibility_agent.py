@@ -1,7 +1,12 @@
 from langchain_google_genai import ChatGoogleGenerativeAI
+from collections import OrderedDict
 from typing import Dict, Tuple, List
+import hashlib
 from vendor_risk_analyzer.config import RISK_THRESHOLDS, GOOGLE_API_KEY
 
+# Number of LLM responses kept per agent, keyed by prompt hash
+LLM_CACHE_SIZE = 1024
+
 class CredibilityAgent:
     def __init__(self):
         self.llm = ChatGoogleGenerativeAI(
@@ -10,6 +15,22 @@ class CredibilityAgent:
             temperature=0,
             convert_system_message_to_human=True
         )
+        # Prompts are built deterministically from the inputs and temperature is 0,
+        # so re-analysing the same vendor can reuse earlier responses
+        self._response_cache = OrderedDict()
+
+    def _invoke_cached(self, prompt: str) -> str:
+        """Invoke the LLM, reusing the response for a previously seen prompt."""
+        key = hashlib.blake2b(prompt.encode(), digest_size=16).hexdigest()
+        if key in self._response_cache:
+            self._response_cache.move_to_end(key)
+            return self._response_cache[key]
+
+        content = self.llm.invoke(prompt).content
+        self._response_cache[key] = content
+        if len(self._response_cache) > LLM_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+        return content
         
     def generate_risk_assessment(self, vendor_data: Dict, risk_signals: Dict) -> Tuple[float, str]:
         """Generate comprehensive risk assessment and justification."""
@@ -59,8 +80,7 @@ class CredibilityAgent:
         Please provide a detailed analysis of the risk factors and recommendations for risk mitigation.
         """
         
-        response = self.llm.invoke(prompt)
-        return response.content
+        return self._invoke_cached(prompt)
         
     def generate_recommendations(self, risk_assessment: Tuple[float, str]) -> List[str]:
         """Generate specific recommendations based on risk assessment."""
@@ -75,5 +95,4 @@ class CredibilityAgent:
         Please provide 3-5 specific recommendations for risk mitigation or vendor management.
         """
         
-        response = self.llm.invoke(prompt)
-        return response.content.split('\n') 
\ No newline at end of file
+        return self._invoke_cached(prompt).split('\n') 
\ No newline at end of file
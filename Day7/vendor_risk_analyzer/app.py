@@ -2,8 +2,13 @@ import streamlit as st
 import os
 from pathlib import Path
 import json
+import re
 from datetime import datetime
 
+# State code, PAN, entity number, default 'Z' and check character
+GSTIN_RE = re.compile(r'\d{2}[A-Z]{5}\d{4}[A-Z][A-Z\d]Z[A-Z\d]')
+REQUIRED_DOCS = ("pan", "registration", "address_proof")
+
 def analyze_vendor(vendor_name: str, documents: dict) -> dict:
     """Analyze vendor information and documents."""
     # Basic analysis logic
@@ -12,15 +17,14 @@ def analyze_vendor(vendor_name: str, documents: dict) -> dict:
     
     # Check GSTIN
     if documents.get("gstin"):
-        if len(documents["gstin"]) == 15:
+        if GSTIN_RE.fullmatch(documents["gstin"].strip().upper()):
             findings.append("✅ GSTIN format is valid")
         else:
             findings.append("❌ GSTIN format is invalid")
             risk_score += 0.2
     
     # Check documents
-    required_docs = ["pan", "registration", "address_proof"]
-    for doc in required_docs:
+    for doc in REQUIRED_DOCS:
         if documents.get(doc):
             findings.append(f"✅ {doc.replace('_', ' ').title()} document provided")
         else:
@@ -68,8 +68,7 @@ class RiskAssessor:
         
         # Update vendor risk score based on assessment
         if "risk_factors" in result:
-            for factor in result["risk_factors"]:
-                vendor.add_risk_factor(factor)
+            vendor.add_risk_factors([(factor, 1.0) for factor in result["risk_factors"]])
                 
         if "risk_score" in result:
             vendor.risk_score = result["risk_score"]
@@ -1,6 +1,22 @@
 from typing import Dict
 import logging
 
+# Simulated external data added when a risk category has at least one finding:
+# category -> (external_data fields, insight message)
+ENRICHMENT_RULES = {
+    'financial': (
+        {
+            'credit_rating_source': 'Simulated Credit Bureau A',
+            'financial_stability_score': 75  # Simulated score
+        },
+        "Simulated financial stability data added from external source."
+    ),
+    'compliance': (
+        {'regulatory_check_source': 'Simulated Regulatory Database'},
+        "Simulated regulatory compliance data added."
+    )
+}
+
 class DataEnricher:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
@@ -27,14 +43,11 @@ class DataEnricher:
 
         # --- Placeholder for actual enrichment logic --- 
         # Example: Simulating adding some external data or insights
-        if "financial" in risk_analysis.get('risk_categories', {}) and risk_analysis['risk_categories']['financial']:
-            enriched_data['external_data']['credit_rating_source'] = 'Simulated Credit Bureau A'
-            enriched_data['external_data']['financial_stability_score'] = 75 # Simulated score
-            enriched_data['insights'].append("Simulated financial stability data added from external source.")
-
-        if "compliance" in risk_analysis.get('risk_categories', {}) and risk_analysis['risk_categories']['compliance']:
-            enriched_data['external_data']['regulatory_check_source'] = 'Simulated Regulatory Database'
-            enriched_data['insights'].append("Simulated regulatory compliance data added.")
+        risk_categories = risk_analysis.get('risk_categories', {})
+        for category, (external_data, insight) in ENRICHMENT_RULES.items():
+            if risk_categories.get(category):
+                enriched_data['external_data'].update(external_data)
+                enriched_data['insights'].append(insight)
 
         # You would integrate real external APIs or databases here.
         # E.g., fetch company registration details, news mentions, financial statements, etc.
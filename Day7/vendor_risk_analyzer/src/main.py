@@ -2,6 +2,7 @@ from fastapi import FastAPI, UploadFile, File, Form, HTTPException
 from fastapi.responses import JSONResponse, HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.encoders import jsonable_encoder
 from typing import List
 import os
 import shutil
@@ -115,7 +116,8 @@ async def analyze_vendor(
         # Clean up uploaded files
         shutil.rmtree(vendor_dir)
         
-        return JSONResponse(content=final_response)
+        # RiskFactor dataclasses are converted to plain dicts here
+        return JSONResponse(content=jsonable_encoder(final_response))
         
     except Exception as e:
         logger.error(f"Error during analysis: {str(e)}")
@@ -1,8 +1,11 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional, Tuple
 from datetime import datetime
 
 class Vendor(BaseModel):
+    # Assignments are not re-validated, keeping risk-factor updates cheap in bulk ingestion
+    model_config = ConfigDict(validate_assignment=False, arbitrary_types_allowed=True)
+
     name: str
     gstin: str
     pan: Optional[str] = None
@@ -10,14 +13,19 @@ class Vendor(BaseModel):
     risk_score: float = 0.0
     risk_factors: List[str] = Field(default_factory=list)
     last_updated: datetime = Field(default_factory=datetime.now)
-    
-    class Config:
-        arbitrary_types_allowed = True
 
     def add_risk_factor(self, factor: str, weight: float = 1.0):
         """Add a risk factor and update the risk score"""
         self.risk_factors.append(factor)
-        self.risk_score = min(100, self.risk_score + weight)
+        self.risk_score = min(100.0, self.risk_score + float(weight))
+
+    def add_risk_factors(self, factors: List[Tuple[str, float]]):
+        """Add several (factor, weight) pairs, updating the risk score once"""
+        risk_score = self.risk_score
+        for factor, weight in factors:
+            self.risk_factors.append(factor)
+            risk_score = min(100.0, risk_score + float(weight))
+        self.risk_score = risk_score
         
     def add_document(self, document_path: str):
         """Add a document to the vendor's document list"""
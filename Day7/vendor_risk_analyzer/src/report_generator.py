@@ -43,8 +43,8 @@ class ReportGenerator:
         if risk_factors:
             report_summary += "Identified Risk Factors:\n"
             for factor in risk_factors:
-                report_summary += f"  - Category: {factor.get('category', 'N/A')}, Severity: {factor.get('severity', 'N/A').upper()}\n"
-                context_cleaned = (factor.get('context', 'N/A')).replace('\n', ' ')
+                report_summary += f"  - Category: {factor.category}, Severity: {factor.severity.upper()}\n"
+                context_cleaned = factor.context.replace('\n', ' ')
                 report_summary += f"    Context: \"{(context_cleaned)[:100]}...\"\n"
         else:
             report_summary += "No significant risk factors identified.\n"
@@ -108,11 +108,11 @@ class ReportGenerator:
 
         # Specific recommendations based on risk factors
         for risk in risk_factors:
-            if "financial" in risk.get("category", "").lower():
+            if "financial" in risk.category.lower():
                 recommendations.append("Request financial statements and credit reports")
-            elif "compliance" in risk.get("category", "").lower():
+            elif "compliance" in risk.category.lower():
                 recommendations.append("Verify compliance certifications")
-            elif "legal" in risk.get("category", "").lower():
+            elif "legal" in risk.category.lower():
                 recommendations.append("Review legal documentation with legal team")
 
         return list(set(recommendations))  # Remove duplicates
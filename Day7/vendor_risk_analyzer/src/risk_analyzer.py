@@ -1,47 +1,247 @@
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+import hashlib
 import logging
+import os
 import re
+import time
+from bisect import bisect_right
+from dataclasses import dataclass
 from datetime import datetime
 
+try:
+    import hyperscan
+except ImportError:  # Optional: without it every category regex runs on every scan
+    hyperscan = None
+
+try:
+    from diskcache import Cache
+except ImportError:  # Optional: without it results are only reused within a single analyze call
+    Cache = None
+
+# Risk signal patterns per category; combined into one regex per category by RiskAnalyzer
+RISK_PATTERNS = {
+    'financial': [
+        r'(?i)overdue|outstanding|pending payment|late payment',
+        r'(?i)bankruptcy|insolvency|liquidation',
+        r'(?i)financial distress|financial difficulty',
+        r'(?i)default|breach of contract'
+    ],
+    'compliance': [
+        r'(?i)expired.*gstin|invalid.*gstin',
+        r'(?i)expired.*pan|invalid.*pan',
+        r'(?i)non-compliant|violation|breach',
+        r'(?i)regulatory.*issue|compliance.*issue'
+    ],
+    'legal': [
+        r'(?i)lawsuit|litigation|legal action',
+        r'(?i)court case|legal dispute',
+        r'(?i)breach of contract|contract violation',
+        r'(?i)legal notice|cease and desist'
+    ],
+    'operational': [
+        r'(?i)delayed delivery|late delivery',
+        r'(?i)quality issue|defect|faulty',
+        r'(?i)service disruption|outage',
+        r'(?i)capacity issue|resource constraint'
+    ]
+}
+
+# Severity of a risk factor, keyed by category and a regex over the source pattern;
+# resolved once per pattern when RiskAnalyzer is created
+SEVERITY_MAP = {
+    'financial': {
+        r'bankruptcy|insolvency': 'high',
+        r'overdue|outstanding': 'medium',
+        r'default': 'high'
+    },
+    'compliance': {
+        r'expired.*gstin|invalid.*gstin': 'high',
+        r'non-compliant': 'medium',
+        r'violation': 'high'
+    },
+    'legal': {
+        r'lawsuit|litigation': 'high',
+        r'legal dispute': 'medium',
+        r'breach of contract': 'high'
+    },
+    'operational': {
+        r'delayed delivery': 'medium',
+        r'quality issue': 'high',
+        r'service disruption': 'medium'
+    }
+}
+
+# Characters of surrounding text kept on each side of a match
+CONTEXT_SIZE = 100
+
+# Joins documents into one buffer for scanning. No pattern can match across it:
+# '.' never matches the newlines and the alternatives are plain words.
+DOCUMENT_SEPARATOR = '\n\x00\n'
+
+# Characters of document text joined into one buffer per scan; bounds memory when
+# documents are streamed
+SCAN_CHUNK_SIZE = 1 << 20
+
+# Suggested location for the opt-in on-disk cache of risk factors per document text,
+# reused across runs and processes; next to this module rather than in whatever
+# directory the server starts from
+RISK_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.risk_cache')
+# Cached factors hold excerpts of vendor documents, so entries expire and the cache is bounded
+RISK_CACHE_TTL = 7 * 24 * 60 * 60  # 7 days
+RISK_CACHE_SIZE_LIMIT = 256 * 1024 * 1024  # bytes
+
+# Last (time.time(), isoformat) pair handed out by coarse_iso_now
+_ts_cache = [0.0, '']
+
+def coarse_iso_now() -> str:
+    """Current local time in ISO format, rebuilt at most once per second so a batch
+    of analyses shares one formatted timestamp"""
+    t = time.time()
+    if t - _ts_cache[0] > 1.0:
+        _ts_cache[0] = t
+        _ts_cache[1] = datetime.fromtimestamp(t).isoformat()
+    return _ts_cache[1]
+
+@dataclass(frozen=True)
+class RiskFactor:
+    """A single risk signal matched in a document"""
+    # Slots keep per-match objects much smaller than the dicts used before
+    __slots__ = ('category', 'pattern', 'context', 'severity')
+    category: str
+    pattern: str
+    context: str
+    severity: str
+
+    def __reduce__(self):
+        # Frozen slotted instances can't be restored attribute by attribute, so pickle
+        # (used by the on-disk cache) rebuilds them through the constructor
+        return (RiskFactor, (self.category, self.pattern, self.context, self.severity))
+
+# A pattern made only of literal words joined by '|'
+LITERAL_PATTERN = re.compile(r'[\w \-]+(?:\|[\w \-]+)*')
+
+def _words_overlap(a: str, b: str) -> bool:
+    """Whether matches of two literal words could share characters in some text"""
+    return a in b or b in a or any(
+        a.endswith(b[:k]) or b.endswith(a[:k]) for k in range(1, min(len(a), len(b)))
+    )
+
 class RiskAnalyzer:
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[str] = None):
         self.logger = logging.getLogger(__name__)
+        # Compiled once up front; the named group that matched identifies the source pattern.
+        # The inline (?i) becomes IGNORECASE since global flags can't sit inside an alternation.
         self.risk_patterns = {
-            'financial': [
-                r'(?i)overdue|outstanding|pending payment|late payment',
-                r'(?i)bankruptcy|insolvency|liquidation',
-                r'(?i)financial distress|financial difficulty',
-                r'(?i)default|breach of contract'
-            ],
-            'compliance': [
-                r'(?i)expired.*gstin|invalid.*gstin',
-                r'(?i)expired.*pan|invalid.*pan',
-                r'(?i)non-compliant|violation|breach',
-                r'(?i)regulatory.*issue|compliance.*issue'
-            ],
-            'legal': [
-                r'(?i)lawsuit|litigation|legal action',
-                r'(?i)court case|legal dispute',
-                r'(?i)breach of contract|contract violation',
-                r'(?i)legal notice|cease and desist'
-            ],
-            'operational': [
-                r'(?i)delayed delivery|late delivery',
-                r'(?i)quality issue|defect|faulty',
-                r'(?i)service disruption|outage',
-                r'(?i)capacity issue|resource constraint'
+            category: [
+                re.compile('|'.join(f'(?P<{category}_{i}>{patterns[i].removeprefix("(?i)")})' for i in group), re.IGNORECASE)
+                for group in self._scan_groups(patterns)
             ]
+            for category, patterns in RISK_PATTERNS.items()
+        }
+        # Cached factors depend on the patterns, how they are grouped for scanning, their
+        # severities and the context size; keying entries by this version makes any change
+        # to them miss the old entries
+        self.patterns_version = hashlib.blake2b(
+            repr((
+                RISK_PATTERNS,
+                {category: [regex.pattern for regex in regexes] for category, regexes in self.risk_patterns.items()},
+                SEVERITY_MAP,
+                CONTEXT_SIZE
+            )).encode(), digest_size=4
+        ).hexdigest()
+        # Off unless a directory (e.g. RISK_CACHE_DIR) is given
+        self.cache = Cache(cache_dir, size_limit=RISK_CACHE_SIZE_LIMIT) if Cache and cache_dir else None
+        self.group_to_source = {
+            f'{category}_{i}': pattern
+            for category, patterns in RISK_PATTERNS.items()
+            for i, pattern in enumerate(patterns)
         }
+        # Position of each pattern in RISK_PATTERNS; factors within a document are
+        # ordered by it, as scanning the patterns one by one would produce them
+        self.group_rank = {group: rank for rank, group in enumerate(self.group_to_source)}
+        # The pattern set is fixed, so each pattern's severity is resolved once here
+        # and looked up by group name for every match
+        self.group_severity = {
+            f'{category}_{i}': self._get_severity(category, pattern)
+            for category, patterns in RISK_PATTERNS.items()
+            for i, pattern in enumerate(patterns)
+        }
+        # A single high-severity hit already makes the overall level 'high', so quick
+        # mode looks for any of these patterns and stops at the first one found. This
+        # agrees with full mode only because the full scan never hides a pattern's match
+        # behind another one (see _scan_groups).
+        self.high_severity_regex = re.compile(
+            '|'.join(
+                f'(?:{self.group_to_source[group].removeprefix("(?i)")})'
+                for group, severity in self.group_severity.items() if severity == 'high'
+            ),
+            re.IGNORECASE
+        )
+        self.hs_db, self.hs_categories = self._build_hyperscan_db() if hyperscan else (None, [])
+
+    @staticmethod
+    def _scan_groups(patterns: List[str]) -> List[List[int]]:
+        """Group a category's pattern indices into scans that find exactly what scanning
+        each pattern on its own would.
+
+        An alternation reports one match per position, so a pattern joins the category's
+        shared union only if it is literal and none of its words can overlap a word of
+        a pattern already in the union. Anything else, such as 'expired.*gstin', whose
+        '.*' can swallow another pattern's match, is scanned on its own.
+        """
+        union, union_words, standalone = [], [], []
+        for i, pattern in enumerate(patterns):
+            source = pattern.removeprefix('(?i)')
+            words = source.lower().split('|')
+            if LITERAL_PATTERN.fullmatch(source) and not any(
+                _words_overlap(word, other) for word in words for other in union_words
+            ):
+                union.append(i)
+                union_words.extend(words)
+            else:
+                standalone.append([i])
+        return ([union] if union else []) + standalone
+
+    def _build_hyperscan_db(self):
+        """Compile all patterns into one Hyperscan database, reporting at most one match per pattern"""
+        expressions, categories = [], []
+        for category, patterns in RISK_PATTERNS.items():
+            for pattern in patterns:
+                expressions.append(pattern.removeprefix('(?i)').encode())
+                categories.append(category)
 
-    def analyze(self, processed_docs: Dict) -> Dict:
+        db = hyperscan.Database()
+        db.compile(
+            expressions=expressions,
+            ids=list(range(len(expressions))),
+            elements=len(expressions),
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(expressions)
+        )
+        return db, categories
+
+    def _categories_present(self, text: str) -> set:
+        """Find, in a single Hyperscan pass, which categories have at least one match in text"""
+        present = set()
+
+        def on_match(pattern_id, start, end, flags, context):
+            present.add(self.hs_categories[pattern_id])
+
+        self.hs_db.scan(text.encode(), match_event_handler=on_match)
+        return present
+
+    def analyze(self, processed_docs: Union[Dict, Iterable[Dict]], mode: str = 'full') -> Dict:
         """
         Analyze processed documents for risk signals
         
         Args:
-            processed_docs: Dictionary containing processed document data
+            processed_docs: Dictionary containing processed document data, or an iterable
+                (e.g. a generator reading from disk) yielding one document dict at a time
+            mode: 'full' collects every risk factor; 'quick' returns as soon as a
+                high-severity signal is found, with risk_level 'high' and no factors
             
         Returns:
-            Dictionary containing risk analysis results
+            Dictionary containing risk analysis results; 'risk_factors' holds RiskFactor
+            objects and each 'risk_categories' list holds indices into 'risk_factors'
         """
         try:
             risk_analysis = {
@@ -53,28 +253,47 @@ class RiskAnalyzer:
                     'operational': []
                 },
                 'risk_level': 'low',
-                'timestamp': datetime.now().isoformat()
+                'timestamp': coarse_iso_now()
             }
 
-            # Analyze each document
-            for doc in processed_docs.get('processed_documents', []):
-                text = doc.get('extracted_text', '')
-                if not text:
-                    continue
-
-                # Check each risk category
-                for category, patterns in self.risk_patterns.items():
-                    for pattern in patterns:
-                        matches = re.finditer(pattern, text)
-                        for match in matches:
-                            risk_factor = {
-                                'category': category,
-                                'pattern': pattern,
-                                'context': self._get_context(text, match.start(), match.end()),
-                                'severity': self._get_severity(category, pattern)
-                            }
-                            risk_analysis['risk_factors'].append(risk_factor)
-                            risk_analysis['risk_categories'][category].append(risk_factor)
+            if isinstance(processed_docs, dict):
+                processed_docs = processed_docs.get('processed_documents', [])
+
+            risk_factors = []
+            # Factors per distinct text, keyed by a digest so identical texts (shared templates,
+            # boilerplate) are scanned once without keeping the texts themselves alive;
+            # texts already scanned in an earlier run come from the on-disk cache
+            seen = {}
+            for chunk in self._text_chunks(processed_docs):
+                # Quick mode: one high-severity hit anywhere already decides the level
+                if mode == 'quick' and self.high_severity_regex.search(DOCUMENT_SEPARATOR.join(chunk)):
+                    risk_analysis['risk_level'] = 'high'
+                    return risk_analysis
+
+                keys = [hashlib.blake2b(text.encode(), digest_size=16).digest() for text in chunk]
+                distinct = {}
+                for key, text in zip(keys, chunk):
+                    if key in seen or key in distinct:
+                        continue
+                    cached = self.cache.get((key, self.patterns_version)) if self.cache is not None else None
+                    if cached is not None:
+                        seen[key] = cached
+                    else:
+                        distinct[key] = text
+
+                scanned = dict(zip(distinct, self._scan(list(distinct.values()))))
+                seen.update(scanned)
+                if self.cache is not None and scanned:
+                    # One transaction per chunk instead of a commit per document
+                    with self.cache.transact():
+                        for key, factors in scanned.items():
+                            self.cache.set((key, self.patterns_version), factors, expire=RISK_CACHE_TTL)
+                for key in keys:
+                    risk_factors.extend(seen[key])
+
+            for index, factor in enumerate(risk_factors):
+                risk_analysis['risk_categories'][factor.category].append(index)
+            risk_analysis['risk_factors'] = risk_factors
 
             # Calculate overall risk level
             risk_analysis['risk_level'] = self._calculate_risk_level(risk_analysis['risk_factors'])
@@ -85,67 +304,88 @@ class RiskAnalyzer:
             self.logger.error(f"Error analyzing documents: {str(e)}")
             raise
 
-    def _get_context(self, text: str, start: int, end: int, context_size: int = 100) -> str:
-        """Extract context around matched pattern"""
-        start = max(0, start - context_size)
-        end = min(len(text), end + context_size)
-        return text[start:end].strip()
+    def _text_chunks(self, documents: Iterable[Dict]) -> Iterator[List[str]]:
+        """Group the non-empty document texts into chunks of about SCAN_CHUNK_SIZE characters,
+        so only one chunk of a streamed corpus is held in memory at a time"""
+        chunk, size = [], 0
+        for doc in documents:
+            text = doc.get('extracted_text', '')
+            if not text:
+                continue
+            chunk.append(text)
+            size += len(text)
+            if size >= SCAN_CHUNK_SIZE:
+                yield chunk
+                chunk, size = [], 0
+        if chunk:
+            yield chunk
+
+    def _scan(self, texts: List[str]) -> List[List[RiskFactor]]:
+        """Find the risk factors in each text, returned per text in document order"""
+        # Scan all texts together, once per scan group, and map each match back
+        # to its text through the texts' start offsets
+        text = DOCUMENT_SEPARATOR.join(texts)
+        doc_starts = []
+        offset = 0
+        for doc_text in texts:
+            doc_starts.append(offset)
+            offset += len(doc_text) + len(DOCUMENT_SEPARATOR)
+        # Matches are grouped per document to keep the document-by-document order,
+        # as (pattern rank, start, factor) so each document's factors can be put in pattern order
+        doc_matches = [[] for _ in texts]
+
+        # With Hyperscan, one pass over the text finds the categories with any match,
+        # and only those are scanned again for exact positions
+        category_regexes = self.risk_patterns.items()
+        if self.hs_db is not None:
+            present = self._categories_present(text)
+            category_regexes = [(category, regexes) for category, regexes in category_regexes if category in present]
+
+        # Check each risk category
+        for category, regexes in category_regexes:
+            for regex in regexes:
+                for match in regex.finditer(text):
+                    start, end = match.span()
+                    doc_index = bisect_right(doc_starts, start) - 1
+                    # Context stays within the matched document
+                    doc_start = doc_starts[doc_index]
+                    doc_end = doc_start + len(texts[doc_index])
+                    doc_matches[doc_index].append((self.group_rank[match.lastgroup], start, RiskFactor(
+                        category=category,
+                        pattern=self.group_to_source[match.lastgroup],
+                        context=text[max(doc_start, start - CONTEXT_SIZE):min(doc_end, end + CONTEXT_SIZE)].strip(),
+                        severity=self.group_severity[match.lastgroup]
+                    )))
+
+        # A union scan yields a category's matches by position, so restore pattern order
+        return [
+            [factor for _, _, factor in sorted(matches, key=lambda entry: entry[:2])]
+            for matches in doc_matches
+        ]
 
     def _get_severity(self, category: str, pattern: str) -> str:
         """Determine severity of risk factor"""
-        # Define severity based on category and pattern
-        severity_map = {
-            'financial': {
-                r'bankruptcy|insolvency': 'high',
-                r'overdue|outstanding': 'medium',
-                r'default': 'high'
-            },
-            'compliance': {
-                r'expired.*gstin|invalid.*gstin': 'high',
-                r'non-compliant': 'medium',
-                r'violation': 'high'
-            },
-            'legal': {
-                r'lawsuit|litigation': 'high',
-                r'legal dispute': 'medium',
-                r'breach of contract': 'high'
-            },
-            'operational': {
-                r'delayed delivery': 'medium',
-                r'quality issue': 'high',
-                r'service disruption': 'medium'
-            }
-        }
-
         # Check category-specific patterns
-        if category in severity_map:
-            for pattern_key, severity in severity_map[category].items():
-                if re.search(pattern_key, pattern, re.IGNORECASE):
-                    return severity
+        for pattern_key, severity in SEVERITY_MAP.get(category, {}).items():
+            if re.search(pattern_key, pattern, re.IGNORECASE):
+                return severity
 
         # Default severity
         return 'medium'
 
-    def _calculate_risk_level(self, risk_factors: List[Dict]) -> str:
+    def _calculate_risk_level(self, risk_factors: List[RiskFactor]) -> str:
         """Calculate overall risk level based on risk factors"""
-        if not risk_factors:
-            return 'low'
-
-        # Count risk factors by severity
-        severity_counts = {
-            'high': 0,
-            'medium': 0,
-            'low': 0
-        }
-
+        # A single high-severity factor decides the level, so stop at the first one
+        # instead of counting every severity
+        medium_count = 0
         for factor in risk_factors:
-            severity = factor.get('severity', 'medium')
-            severity_counts[severity] += 1
+            if factor.severity == 'high':
+                return 'high'
+            if factor.severity == 'medium':
+                medium_count += 1
 
         # Determine risk level based on severity counts
-        if severity_counts['high'] > 0:
-            return 'high'
-        elif severity_counts['medium'] > 1:
+        if medium_count > 1:
             return 'medium'
         else:
-            return 'low' 
\ No newline at end of file
+            return 'low'
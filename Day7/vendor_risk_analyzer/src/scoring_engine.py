@@ -1,6 +1,7 @@
 from typing import Dict, List
 import logging
 from datetime import datetime
+import numpy as np
 
 class ScoringEngine:
     def __init__(self):
@@ -16,6 +17,12 @@ class ScoringEngine:
             'medium': 3,
             'high': 5
         }
+        # Category order shared by the component vectors and the weight vector
+        self._categories = list(self.risk_weights)
+        self._category_index = {category: i for i, category in enumerate(self._categories)}
+        self._weights = np.array([self.risk_weights[category] for category in self._categories])
+        # Weights divided by their total once, so scoring is a single product per batch
+        self._normalized_weights = self._weights / self._weights.sum()
 
     def calculate_score(self, analysis_results: Dict) -> Dict:
         """
@@ -27,50 +34,48 @@ class ScoringEngine:
         Returns:
             Dictionary with the overall score, risk level, and component scores.
         """
-        total_weighted_score = 0
-        total_weight = 0
-        component_scores = {}
+        return self.calculate_scores_batch([analysis_results])[0]
 
+    def calculate_scores_batch(self, analyses: List[Dict]) -> List[Dict]:
+        """
+        Scores several vendors at once with a single matrix-vector product.
+
+        Args:
+            analyses: Risk analysis results, one per vendor, as passed to calculate_score.
+
+        Returns:
+            One score dictionary per vendor, in the same order.
+        """
+        components = np.array(
+            [self._sum_severity_scores(analysis) for analysis in analyses], dtype=int
+        ).reshape(len(analyses), len(self._categories))
+
+        # Simple normalization for demonstration: assume max possible score for a category is 10 (e.g., 2 high risks)
+        normalized = np.minimum(components / 10, 1.0)  # Cap at 1.0
+        # Invert for credibility score (higher is better)
+        overall_scores = (1 - normalized @ self._normalized_weights) * 100
+
+        return [
+            {
+                "score": round(float(overall_score), 2),
+                "risk_level": self._determine_overall_risk_level(overall_score),
+                "components": dict(zip(self._categories, component_row.tolist()))
+            }
+            for overall_score, component_row in zip(overall_scores, components)
+        ]
+
+    def _sum_severity_scores(self, analysis_results: Dict) -> List[int]:
+        """Sum the severity scores of the risk factors in each category"""
+        component_scores = [0] * len(self._categories)
         risk_factors = analysis_results.get('risk_analysis', {}).get('risk_factors', [])
-        
-        # Initialize scores for all categories
-        for category in self.risk_weights.keys():
-            component_scores[category] = 0
 
         for factor in risk_factors:
-            category = factor.get('category')
-            severity = factor.get('severity', 'low').lower()
-            
-            if category in self.risk_weights and severity in self.severity_scores:
-                severity_score = self.severity_scores[severity]
-                component_scores[category] += severity_score # Sum severity scores for each category
-
-        # Calculate weighted average for each component and overall score
-        for category, weight in self.risk_weights.items():
-            score_for_category = component_scores.get(category, 0)
-            # Normalize score_for_category, assuming max severity score for a single factor is 5
-            # If multiple factors can be in one category, this normalization needs adjustment
-            # For simplicity, let's assume maximum possible severity score for a category is proportional to num factors or a fixed max.
-            # For now, let's just sum and then normalize based on a hypothetical max per category if needed
-
-            # Simple normalization for demonstration: assume max possible score for a category is 10 (e.g., 2 high risks)
-            normalized_score = min(score_for_category / 10, 1.0) # Cap at 1.0
-            total_weighted_score += normalized_score * weight
-            total_weight += weight
-        
-        overall_score = 0
-        if total_weight > 0:
-            overall_score = (1 - (total_weighted_score / total_weight)) * 100 # Invert for credibility score (higher is better)
-        else:
-            overall_score = 100 # No risks, perfect score
-
-        overall_risk_level = self._determine_overall_risk_level(overall_score)
+            index = self._category_index.get(factor.category)
+            severity_score = self.severity_scores.get(factor.severity.lower())
+            if index is not None and severity_score is not None:
+                component_scores[index] += severity_score
 
-        return {
-            "score": round(overall_score, 2),
-            "risk_level": overall_risk_level,
-            "components": component_scores
-        }
+        return component_scores
 
     def _determine_overall_risk_level(self, score: float) -> str:
         """
@@ -0,0 +1,65 @@
+import unittest
+
+from src.risk_analyzer import RiskAnalyzer
+
+
+def analyze_text(analyzer, text, mode='full'):
+    return analyzer.analyze({'processed_documents': [{'extracted_text': text}]}, mode=mode)
+
+
+class RiskAnalyzerTest(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = RiskAnalyzer(cache_dir=None)
+
+    def test_wildcard_pattern_does_not_hide_higher_severity_match(self):
+        # 'regulatory.*issue' spans 'expired GSTIN'; the high-severity match must still be found
+        result = analyze_text(self.analyzer, "The regulatory filing shows an expired GSTIN; this issue is open.")
+
+        self.assertEqual(result['risk_level'], 'high')
+        self.assertCountEqual(
+            [(factor.pattern, factor.severity) for factor in result['risk_factors']],
+            [
+                ('(?i)expired.*gstin|invalid.*gstin', 'high'),
+                ('(?i)regulatory.*issue|compliance.*issue', 'medium'),
+            ]
+        )
+        self.assertEqual(len(result['risk_categories']['compliance']), 2)
+
+    def test_factors_follow_pattern_order_within_a_document(self):
+        # Same order as scanning each pattern in turn: by pattern, then by position
+        result = analyze_text(self.analyzer, "Bankruptcy filed after a late payment; invoices still overdue.")
+
+        self.assertEqual(
+            [factor.pattern for factor in result['risk_factors']],
+            [
+                '(?i)overdue|outstanding|pending payment|late payment',
+                '(?i)overdue|outstanding|pending payment|late payment',
+                '(?i)bankruptcy|insolvency|liquidation',
+            ]
+        )
+
+    def test_quick_and_full_mode_agree_on_risk_level(self):
+        texts = [
+            "The regulatory filing shows an expired GSTIN; this issue is open.",
+            "Regulatory violation issue reported; vendor is non-compliant.",
+            "Breach of contract violation under review.",
+            "One late payment and one delayed delivery.",
+            "Payment overdue. Quality issue with the last shipment.",
+            "No concerns were raised during the audit.",
+        ]
+        for text in texts:
+            with self.subTest(text=text):
+                self.assertEqual(
+                    analyze_text(self.analyzer, text, mode='quick')['risk_level'],
+                    analyze_text(self.analyzer, text)['risk_level']
+                )
+
+        documents = {'processed_documents': [{'extracted_text': text} for text in texts]}
+        self.assertEqual(
+            self.analyzer.analyze(documents, mode='quick')['risk_level'],
+            self.analyzer.analyze(documents)['risk_level']
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,8 @@ from fastapi import FastAPI, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
 import os
 from backend.flows.vendor_risk_flow import run_vendor_risk_flow
+from backend.external_intelligence_agent import get_external_intelligence_agent
+from backend.credibility_scoring_agent import get_credibility_scoring_agent
 from backend.retriever.retriever_pipeline import get_retriever
 from backend.data.sample_knowledge_base import initialize_sample_knowledge_base
 
@@ -29,6 +31,14 @@ async def startup_event():
         print("RAG system initialized successfully!")
     except Exception as e:
         print(f"Error initializing RAG system: {e}")
+    # Build the LLM-backed agents now so the first /analyze request doesn't pay for
+    # creating their clients; the flow reuses these process-wide instances. A failure
+    # here is left for /analyze to report rather than taking the whole API down.
+    try:
+        get_external_intelligence_agent()
+        get_credibility_scoring_agent()
+    except Exception as e:
+        print(f"Error initializing agents: {e}")
 
 @app.get("/")
 def read_root():
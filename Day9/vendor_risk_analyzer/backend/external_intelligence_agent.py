@@ -7,20 +7,34 @@ from langchain.agents import Tool, AgentExecutor, LLMSingleActionAgent
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.chains import LLMChain
 from langchain.prompts import PromptTemplate
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any
+import hashlib
 import sys
 import os
+import threading
 
 # Add parent directory to path for config import
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import config
 from .retriever.retriever_pipeline import get_retriever
 
+# Number of enhancement responses kept, keyed by prompt hash
+LLM_CACHE_SIZE = 1024
+# Concurrent enhancement calls when screening vendors in bulk
+BATCH_MAX_WORKERS = 8
+
 class ExternalIntelligenceAgent:
     def __init__(self, llm=None):
         self.llm = llm
         self.use_gemini = config.is_gemini_available()
         self.retriever = get_retriever()
+        # The enhancement prompt is fully determined by the vendor and the retrieved data,
+        # so re-analysing the same vendor reuses the earlier response
+        self._response_cache = OrderedDict()
+        # Batch screening calls invoke_cached from several threads
+        self._response_cache_lock = threading.Lock()
         
         if self.use_gemini and llm is None:
             try:
@@ -43,65 +57,7 @@ class ExternalIntelligenceAgent:
         try:
             # Use the RAG retriever to get compliance data
             compliance_data = self.retriever.retrieve_vendor_compliance_data(vendor_identifiers)
-            
-            # Format retrieved documents for better readability
-            formatted_documents = self.format_retrieved_documents(compliance_data.get("retrieved_documents", []))
-            
-            if self.use_gemini and self.llm:
-                # Use LLM to enhance and structure the retrieved data
-                enhancement_prompt = PromptTemplate(
-                    input_variables=["vendor_info", "retrieved_data"],
-                    template="""
-                    Analyze the following vendor information and retrieved compliance data to provide comprehensive external intelligence:
-                    
-                    Vendor Information:
-                    {vendor_info}
-                    
-                    Retrieved Compliance Data:
-                    {retrieved_data}
-                    
-                    Provide a structured analysis including:
-                    1. MCA (Ministry of Corporate Affairs) status and details
-                    2. GSTIN validation and compliance status
-                    3. Legal cases or regulatory issues
-                    4. Overall compliance score and risk assessment
-                    5. Recommendations for further investigation
-                    
-                    Return the analysis in this JSON format:
-                    {{
-                        "mca_status": "Active/Inactive/Not Found",
-                        "mca_details": "Additional MCA information",
-                        "gstin_status": "Valid/Invalid/Not Found",
-                        "gstin_details": "Additional GSTIN information",
-                        "legal_cases": "Number and details of legal cases",
-                        "regulatory_issues": "Any regulatory compliance issues",
-                        "compliance_score": 0-100,
-                        "risk_level": "Low/Medium/High",
-                        "recommendations": ["Recommendation 1", "Recommendation 2"],
-                        "data_sources": ["Source 1", "Source 2"]
-                    }}
-                    """
-                )
-                
-                enhancement_chain = LLMChain(llm=self.llm, prompt=enhancement_prompt)
-                enhanced_result = enhancement_chain.run(
-                    vendor_info=str(vendor_identifiers),
-                    retrieved_data=str(compliance_data)
-                )
-                
-                # Parse the enhanced result
-                enhanced_data = self.parse_enhanced_result(enhanced_result)
-                
-                # Merge with retrieved data and formatted documents
-                final_data = {**compliance_data, **enhanced_data}
-                final_data["retrieved_documents"] = formatted_documents
-                
-                return final_data
-            else:
-                # Use fallback analysis
-                fallback_data = self.fallback_analysis(vendor_identifiers, compliance_data)
-                fallback_data["retrieved_documents"] = formatted_documents
-                return fallback_data
+            return self.analyze_compliance_data(vendor_identifiers, compliance_data)
             
         except Exception as e:
             print(f"Error in external intelligence: {e}")
@@ -110,6 +66,101 @@ class ExternalIntelligenceAgent:
             basic_data["retrieved_documents"] = self.format_retrieved_documents(basic_data.get("retrieved_documents", []))
             return basic_data
     
+    def fetch_external_compliance_data_batch(self, vendor_identifiers_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Fetch compliance data for several vendors, preserving their order.
+        
+        Retrieval uses one embedding request and one index search for all vendors;
+        the LLM enhancement calls then run concurrently.
+        """
+        compliance_data_list = self.retriever.retrieve_vendor_compliance_data_batch(vendor_identifiers_list)
+        
+        def analyze(vendor_identifiers, compliance_data):
+            try:
+                return self.analyze_compliance_data(vendor_identifiers, dict(compliance_data))
+            except Exception as e:
+                print(f"Error in external intelligence: {e}")
+                # Fallback to basic retrieved data
+                compliance_data["retrieved_documents"] = self.format_retrieved_documents(compliance_data.get("retrieved_documents", []))
+                return compliance_data
+        
+        with ThreadPoolExecutor(max_workers=BATCH_MAX_WORKERS) as executor:
+            return list(executor.map(analyze, vendor_identifiers_list, compliance_data_list))
+    
+    def analyze_compliance_data(self, vendor_identifiers: Dict[str, Any], compliance_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Turn retrieved compliance data into external intelligence for one vendor."""
+        # Format retrieved documents for better readability
+        formatted_documents = self.format_retrieved_documents(compliance_data.get("retrieved_documents", []))
+        
+        if self.use_gemini and self.llm:
+            # Use LLM to enhance and structure the retrieved data
+            enhancement_prompt = PromptTemplate(
+                input_variables=["vendor_info", "retrieved_data"],
+                template="""
+                Analyze the following vendor information and retrieved compliance data to provide comprehensive external intelligence:
+                
+                Vendor Information:
+                {vendor_info}
+                
+                Retrieved Compliance Data:
+                {retrieved_data}
+                
+                Provide a structured analysis including:
+                1. MCA (Ministry of Corporate Affairs) status and details
+                2. GSTIN validation and compliance status
+                3. Legal cases or regulatory issues
+                4. Overall compliance score and risk assessment
+                5. Recommendations for further investigation
+                
+                Return the analysis in this JSON format:
+                {{
+                    "mca_status": "Active/Inactive/Not Found",
+                    "mca_details": "Additional MCA information",
+                    "gstin_status": "Valid/Invalid/Not Found",
+                    "gstin_details": "Additional GSTIN information",
+                    "legal_cases": "Number and details of legal cases",
+                    "regulatory_issues": "Any regulatory compliance issues",
+                    "compliance_score": 0-100,
+                    "risk_level": "Low/Medium/High",
+                    "recommendations": ["Recommendation 1", "Recommendation 2"],
+                    "data_sources": ["Source 1", "Source 2"]
+                }}
+                """
+            )
+            
+            enhanced_result = self.invoke_cached(enhancement_prompt.format(
+                vendor_info=str(vendor_identifiers),
+                retrieved_data=str(compliance_data)
+            ))
+            
+            # Parse the enhanced result
+            enhanced_data = self.parse_enhanced_result(enhanced_result)
+            
+            # Merge with retrieved data and formatted documents
+            final_data = {**compliance_data, **enhanced_data}
+            final_data["retrieved_documents"] = formatted_documents
+            
+            return final_data
+        else:
+            # Use fallback analysis
+            fallback_data = self.fallback_analysis(vendor_identifiers, compliance_data)
+            fallback_data["retrieved_documents"] = formatted_documents
+            return fallback_data
+    
+    def invoke_cached(self, prompt: str) -> str:
+        """Invoke the LLM, reusing the response for a previously seen prompt."""
+        key = hashlib.blake2b(prompt.encode(), digest_size=16).hexdigest()
+        with self._response_cache_lock:
+            if key in self._response_cache:
+                self._response_cache.move_to_end(key)
+                return self._response_cache[key]
+        
+        content = self.llm.invoke(prompt).content
+        with self._response_cache_lock:
+            self._response_cache[key] = content
+            if len(self._response_cache) > LLM_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+        return content
+    
     def format_retrieved_documents(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Format retrieved documents for better readability."""
         formatted_docs = []
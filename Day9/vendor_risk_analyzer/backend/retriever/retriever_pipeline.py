@@ -44,6 +44,25 @@ class RAGRetriever:
             # Fallback: simple hash-based embedding
             return self.fallback_embedding(text)
     
+    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Get embeddings for several texts with a single embedding request."""
+        if not texts:
+            return []
+        if self.use_gemini:
+            try:
+                response = openai.Embedding.create(
+                    input=texts,
+                    model="text-embedding-ada-002"
+                )
+                return [item['embedding'] for item in sorted(response['data'], key=lambda item: item['index'])]
+            except Exception as e:
+                print(f"Error getting embeddings: {e}")
+                # Return zero vectors as fallback
+                return [[0.0] * 1536 for _ in texts]
+        else:
+            # Fallback: simple hash-based embedding
+            return [self.fallback_embedding(text) for text in texts]
+    
     def fallback_embedding(self, text: str) -> List[float]:
         """Generate a simple embedding using text characteristics."""
         # Create a simple embedding based on text characteristics
@@ -69,7 +88,7 @@ class RAGRetriever:
     
     def add_knowledge_base(self, documents: List[str], metadata: List[Dict] = None):
         """Add documents to the knowledge base."""
-        embeddings = [self.get_embedding(doc) for doc in documents]
+        embeddings = self.get_embeddings(documents)
         self.vector_store.add_documents(documents, embeddings, metadata)
     
     def retrieve_external_knowledge(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
@@ -80,7 +99,19 @@ class RAGRetriever:
     
     def retrieve_vendor_compliance_data(self, vendor_info: Dict[str, Any]) -> Dict[str, Any]:
         """Retrieve compliance data for a specific vendor."""
-        # Create query from vendor information
+        # Retrieve relevant documents
+        results = self.retrieve_external_knowledge(self.build_vendor_query(vendor_info), k=3)
+        return self.build_compliance_data(results)
+    
+    def retrieve_vendor_compliance_data_batch(self, vendor_infos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Retrieve compliance data for several vendors with one embedding request and one index search."""
+        queries = [self.build_vendor_query(vendor_info) for vendor_info in vendor_infos]
+        query_embeddings = self.get_embeddings(queries)
+        results = self.vector_store.search_batch(query_embeddings, k=3)
+        return [self.build_compliance_data(vendor_results) for vendor_results in results]
+    
+    def build_vendor_query(self, vendor_info: Dict[str, Any]) -> str:
+        """Create a retrieval query from vendor information."""
         query_parts = []
         if vendor_info.get("PAN"):
             query_parts.append(f"PAN: {vendor_info['PAN']}")
@@ -89,11 +120,10 @@ class RAGRetriever:
         if vendor_info.get("company_name"):
             query_parts.append(f"Company: {vendor_info['company_name']}")
             
-        query = " ".join(query_parts) if query_parts else "vendor compliance data"
-        
-        # Retrieve relevant documents
-        results = self.retrieve_external_knowledge(query, k=3)
-        
+        return " ".join(query_parts) if query_parts else "vendor compliance data"
+    
+    def build_compliance_data(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Structure retrieved documents into compliance data."""
         # Process and structure the results
         compliance_data = {
             "mca_status": "Not found",
@@ -9,6 +9,16 @@ from typing import List, Dict, Any
 import pickle
 import os
 
+# Once the corpus is large enough to train it, exact search is replaced by an IVF-PQ index:
+# vectors are stored as IVFPQ_M one-byte product-quantizer codes and each query only
+# scans the IVFPQ_NPROBE closest of IVFPQ_NLIST clusters
+IVFPQ_NLIST = 4096
+IVFPQ_M = 16
+IVFPQ_NBITS = 8
+IVFPQ_NPROBE = 16
+# faiss wants roughly 39 training points per cluster
+IVFPQ_MIN_VECTORS = 39 * IVFPQ_NLIST
+
 class VectorStore:
     def __init__(self, dimension=1536):  # OpenAI embedding dimension
         self.dimension = dimension
@@ -26,6 +36,7 @@ class VectorStore:
         
         # Add to FAISS index
         self.index.add(embeddings_array)
+        self.maybe_build_ivfpq_index()
         
         # Store documents and metadata
         self.documents.extend(texts)
@@ -33,19 +44,42 @@ class VectorStore:
         
     def search(self, query_embedding: List[float], k: int = 5) -> List[Dict[str, Any]]:
         """Search for similar documents."""
-        query_array = np.array([query_embedding]).astype('float32')
+        return self.search_batch([query_embedding], k)[0]
+    
+    def search_batch(self, query_embeddings: List[List[float]], k: int = 5) -> List[List[Dict[str, Any]]]:
+        """Search for similar documents for several queries in a single index call."""
+        if not query_embeddings:
+            return []
+        query_array = np.array(query_embeddings).astype('float32')
         distances, indices = self.index.search(query_array, k)
         
-        results = []
-        for i, (distance, idx) in enumerate(zip(distances[0], indices[0])):
-            if idx < len(self.documents):
-                results.append({
-                    "document": self.documents[idx],
-                    "metadata": self.metadata[idx],
-                    "distance": float(distance)
-                })
+        batch_results = []
+        for query_distances, query_indices in zip(distances, indices):
+            results = []
+            for distance, idx in zip(query_distances, query_indices):
+                if 0 <= idx < len(self.documents):
+                    results.append({
+                        "document": self.documents[idx],
+                        "metadata": self.metadata[idx],
+                        "distance": float(distance)
+                    })
+            batch_results.append(results)
         
-        return results
+        return batch_results
+    
+    def maybe_build_ivfpq_index(self):
+        """Switch from exact search to a compressed IVF-PQ index once there is enough data to train it."""
+        if isinstance(self.index, faiss.IndexIVFPQ) or self.index.ntotal < IVFPQ_MIN_VECTORS:
+            return
+            
+        vectors = self.index.reconstruct_n(0, self.index.ntotal)
+        # Kept on self so the coarse quantizer outlives this call
+        self.quantizer = faiss.IndexFlatL2(self.dimension)
+        index = faiss.IndexIVFPQ(self.quantizer, self.dimension, IVFPQ_NLIST, IVFPQ_M, IVFPQ_NBITS)
+        index.train(vectors)
+        index.add(vectors)
+        index.nprobe = IVFPQ_NPROBE
+        self.index = index
     
     def save(self, filepath: str):
         """Save the vector store to disk."""
@@ -65,6 +99,9 @@ class VectorStore:
         """Load the vector store from disk."""
         # Load FAISS index
         self.index = faiss.read_index(f"{filepath}_index.faiss")
+        if isinstance(self.index, faiss.IndexIVFPQ):
+            # nprobe is a search-time setting and isn't stored with the index
+            self.index.nprobe = IVFPQ_NPROBE
         
         # Load documents and metadata
         with open(f"{filepath}_data.pkl", "rb") as f:
@@ -6,6 +6,11 @@ st.set_page_config(page_title="Vendor Risk Analyzer", layout="centered")
 st.title("Vendor Risk Analyzer")
 st.write("Upload a vendor document (PDF or text) to analyze risk and credibility.")
 
+@st.cache_resource
+def get_backend_session():
+    # One keep-alive session per process instead of a new connection on every click
+    return requests.Session()
+
 # Agent descriptions for popups
 agent_descriptions = {
     "Document Analysis Agent": "Parses vendor contracts, invoices, and onboarding forms to extract key risk indicators such as PAN, GSTIN, address, and banking details.",
@@ -26,7 +31,7 @@ if uploaded_file:
     if st.button("Analyze Vendor"):
         with st.spinner("Analyzing..."):
             files = {"file": (uploaded_file.name, uploaded_file.getvalue())}
-            response = requests.post("http://localhost:8000/analyze/", files=files)
+            response = get_backend_session().post("http://localhost:8000/analyze/", files=files)
             if response.status_code == 200:
                 result = response.json()
                 st.success("Analysis Complete!")
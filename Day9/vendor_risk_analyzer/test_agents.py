@@ -133,6 +133,43 @@ def test_external_intelligence_agent(extracted_fields):
         print(f"External Intelligence Agent Test Failed: {e}")
         return {}
 
+def test_batch_external_intelligence():
+    """Test batch external intelligence lookups against the single-vendor path."""
+    print("\n" + "=" * 60)
+    print("TESTING BATCH EXTERNAL INTELLIGENCE")
+    print("=" * 60)
+    
+    try:
+        vendors = [
+            {"PAN": "ABCDE1234F", "GSTIN": "22ABCDE1234F1Z5"},
+            {"PAN": "FGHIJ5678K", "GSTIN": "27FGHIJ5678K1Z2"},
+            {"PAN": "ABCDE1234F", "GSTIN": "22ABCDE1234F1Z5"}
+        ]
+        agent = get_external_intelligence_agent()
+        results = agent.fetch_external_compliance_data_batch(vendors)
+        
+        print(f"Batch returned {len(results)} results for {len(vendors)} vendors")
+        if len(results) != len(vendors) or not all(isinstance(result, dict) for result in results):
+            print("Batch result count or shape does not match the input")
+            return False
+        
+        # Without the LLM the analysis is deterministic, so every batch result must match
+        # the single-vendor lookup for the same vendor, in input order
+        compared_fields = ("mca_status", "gstin_status", "legal_cases", "risk_level", "recommendations")
+        if not agent.use_gemini:
+            for vendor, result in zip(vendors, results):
+                single = agent.fetch_external_compliance_data(vendor)
+                if any(result.get(field) != single.get(field) for field in compared_fields):
+                    print(f"Batch result differs from single lookup for {vendor['PAN']}")
+                    return False
+        
+        print(json.dumps(results[0], indent=2))
+        return True
+        
+    except Exception as e:
+        print(f"Batch External Intelligence Test Failed: {e}")
+        return False
+
 def test_credibility_scoring_agent(agent_outputs):
     """Test the credibility scoring agent."""
     print("\n" + "=" * 60)
@@ -210,6 +247,9 @@ def main():
     # Test RAG system
     rag_success = test_rag_system()
     
+    # Test batch external intelligence
+    batch_success = test_batch_external_intelligence()
+    
     # Test complete workflow
     workflow_success = test_complete_workflow()
     
@@ -217,9 +257,10 @@ def main():
     print("TEST RESULTS SUMMARY")
     print("=" * 60)
     print(f"RAG System: {'✓ PASSED' if rag_success else '✗ FAILED'}")
+    print(f"Batch External Intelligence: {'✓ PASSED' if batch_success else '✗ FAILED'}")
     print(f"Agent Workflow: {'✓ PASSED' if workflow_success else '✗ FAILED'}")
     
-    if rag_success and workflow_success:
+    if rag_success and batch_success and workflow_success:
         print("\n🎉 ALL TESTS PASSED! The agent implementation is working correctly.")
         print("\nKey Improvements Made:")
         print("1. ✓ Proper LangChain agents with AgentExecutor")
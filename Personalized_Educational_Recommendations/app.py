@@ -1,16 +1,16 @@
 import os
-import json
+import atexit
+import csv
+import io
 import datetime
-import pandas as pd
+import orjson
 from typing import List, Dict, Any
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field
-from crewai import Agent, Task, Crew
 import google.generativeai as genai
 import requests
 import re
 import streamlit as st
-from langchain_google_genai import ChatGoogleGenerativeAI
 
 # Load environment variables
 load_dotenv()
@@ -22,54 +22,86 @@ SERPER_API_KEY = os.getenv("SERPER_API_KEY")
 genai.configure(api_key=GEMINI_API_KEY)
 model = genai.GenerativeModel("gemini-1.5-flash")
 
-# Initialize Gemini LLM for CrewAI
-gemini_llm = ChatGoogleGenerativeAI(
-    model="gemini-1.5-flash",
-    google_api_key=GEMINI_API_KEY,
-    temperature=0.7
+QUIZ_RESULT_FIELDS = ["Question", "Your Answer", "Correct Answer", "Result", "Points"]
+ANSWER_INDEX = {"A": 0, "B": 1, "C": 2, "D": 3}
+QUESTION_PATTERN = re.compile(
+    r"Question:\s*(?P<q>[^\n]+)\n"
+    r"\s*A\)\s*(?P<a>[^\n]+)\n"
+    r"\s*B\)\s*(?P<b>[^\n]+)\n"
+    r"\s*C\)\s*(?P<c>[^\n]+)\n"
+    r"\s*D\)\s*(?P<d>[^\n]+)\n"
+    r"\s*Answer:\s*(?P<ans>[A-Da-d])"
 )
 
 # Helper Functions
+@st.cache_resource
+def get_quiz_results_file():
+    """Open quiz_results.json once per process and reuse the handle."""
+    quiz_file = open("quiz_results.json", "ab")
+    atexit.register(quiz_file.close)
+    return quiz_file
+
+@st.cache_data(show_spinner=False)
+def results_to_csv(results: List[Dict[str, Any]]) -> bytes:
+    """Convert quiz results to CSV bytes, cached so reruns don't rebuild the export."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=QUIZ_RESULT_FIELDS)
+    writer.writeheader()
+    writer.writerows(results)
+    return buffer.getvalue().encode('utf-8')
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_learning_materials(topic: str) -> Dict[str, Any]:
+    """Search Serper for learning materials on a given topic.
+
+    Raises on any request or HTTP error so that st.cache_data, which doesn't cache
+    exceptions, only keeps successful searches.
+    """
+    url = "https://google.serper.dev/search"
+    headers = {"X-API-KEY": SERPER_API_KEY}
+    
+    def search(query: str) -> Dict[str, Any]:
+        response = requests.post(url, json={"q": query}, headers=headers)
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    
+    # Search for videos
+    video_results = search(f"{topic} tutorial video")
+    
+    # Search for articles
+    article_results = search(f"{topic} guide article")
+    
+    # Search for exercises
+    exercise_results = search(f"{topic} practice exercises")
+    
+    videos = []
+    articles = []
+    exercises = []
+    
+    # Extract videos
+    for v in video_results.get("organic", [])[:3]:
+        videos.append(f"{v['title']}: {v['link']}")
+    
+    # Extract articles
+    for a in article_results.get("organic", [])[:3]:
+        articles.append(f"{a['title']}: {a['link']}")
+        
+    # Extract exercises
+    for e in exercise_results.get("organic", [])[:3]:
+        exercises.append(f"{e['title']}: {e['link']}")
+    
+    return {
+        "topic": topic,
+        "videos": videos,
+        "articles": articles,
+        "exercises": exercises
+    }
+
 def search_learning_materials(topic: str) -> Dict[str, Any]:
     """Search for learning materials on a given topic."""
+    # Not cached itself, so a Serper outage or quota error is retried on the next request
     try:
-        url = "https://google.serper.dev/search"
-        headers = {"X-API-KEY": SERPER_API_KEY}
-        
-        # Search for videos
-        video_query = f"{topic} tutorial video"
-        video_results = requests.post(url, json={"q": video_query}, headers=headers).json()
-        
-        # Search for articles
-        article_query = f"{topic} guide article"
-        article_results = requests.post(url, json={"q": article_query}, headers=headers).json()
-        
-        # Search for exercises
-        exercise_query = f"{topic} practice exercises"
-        exercise_results = requests.post(url, json={"q": exercise_query}, headers=headers).json()
-        
-        videos = []
-        articles = []
-        exercises = []
-        
-        # Extract videos
-        for v in video_results.get("organic", [])[:3]:
-            videos.append(f"{v['title']}: {v['link']}")
-        
-        # Extract articles
-        for a in article_results.get("organic", [])[:3]:
-            articles.append(f"{a['title']}: {a['link']}")
-            
-        # Extract exercises
-        for e in exercise_results.get("organic", [])[:3]:
-            exercises.append(f"{e['title']}: {e['link']}")
-        
-        return {
-            "topic": topic,
-            "videos": videos,
-            "articles": articles,
-            "exercises": exercises
-        }
+        return fetch_learning_materials(topic)
     except Exception as e:
         return {
             "topic": topic,
@@ -95,30 +127,14 @@ Make sure the questions are clear and educational."""
         response = model.generate_content(prompt).text
         questions = []
         
-        # Parse the response
-        question_blocks = response.split("Question:")
-        for block in question_blocks[1:]:  # Skip first empty element
-            lines = [line.strip() for line in block.strip().split("\n") if line.strip()]
-            if len(lines) >= 6:
-                question = lines[0]
-                options = []
-                answer_line = ""
-                
-                for line in lines[1:]:
-                    if line.startswith(('A)', 'B)', 'C)', 'D)')):
-                        options.append(line[3:].strip())
-                    elif line.startswith("Answer:"):
-                        answer_line = line.split(":")[-1].strip()
-                
-                if len(options) == 4 and answer_line:
-                    # Convert answer letter to actual answer text
-                    answer_index = ord(answer_line.upper()) - ord('A')
-                    if 0 <= answer_index < 4:
-                        questions.append({
-                            "question": question,
-                            "options": options,
-                            "answer": options[answer_index]
-                        })
+        # Parse the response in a single pass over the text
+        for match in QUESTION_PATTERN.finditer(response):
+            options = [match["a"].strip(), match["b"].strip(), match["c"].strip(), match["d"].strip()]
+            questions.append({
+                "question": match["q"].strip(),
+                "options": options,
+                "answer": options[ANSWER_INDEX[match["ans"].upper()]]
+            })
         
         return questions[:3]
     except Exception as e:
@@ -165,92 +181,6 @@ Description: [Detailed description]
     except Exception as e:
         return [{"title": f"Error generating projects: {str(e)}", "description": "Unable to generate project suggestions", "level": level}]
 
-# Agents without tools - they will use the functions directly
-learning_agent = Agent(
-    role="Learning Material Curator",
-    goal="Find the best learning resources for a given topic using web search",
-    backstory="""You are an expert researcher with years of experience in educational content curation. 
-    You excel at finding diverse learning materials including videos, articles, and practical exercises.
-    You have access to web search capabilities to find current and relevant learning materials.""",
-    llm=gemini_llm,
-    verbose=True
-)
-
-quiz_agent = Agent(
-    role="Quiz Master",
-    goal="Create effective assessment quizzes for learning topics",
-    backstory="""You are specialized in educational assessment and test creation. 
-    You create engaging multiple-choice questions that test understanding and promote learning.
-    You can generate high-quality quiz questions on any topic.""",
-    llm=gemini_llm,
-    verbose=True
-)
-
-project_agent = Agent(
-    role="Project Mentor",
-    goal="Suggest practical projects matching skill levels",
-    backstory="""You are experienced in curriculum development and project-based learning. 
-    You design hands-on projects that reinforce learning and build practical skills.
-    You can suggest projects appropriate for different skill levels.""",
-    llm=gemini_llm,
-    verbose=True
-)
-
-# Tasks with detailed descriptions
-def create_learning_task(topic: str):
-    return Task(
-        description=f"""Search for comprehensive learning materials about '{topic}'. 
-        Find videos, articles, and exercises that would help someone learn this topic effectively.
-        
-        Use web search to find:
-        1. Educational videos and tutorials
-        2. Articles and guides
-        3. Practice exercises and examples
-        
-        Return the results in a structured format with titles and links.""",
-        agent=learning_agent,
-        expected_output=f"""A comprehensive list of learning materials for {topic} including:
-        - Videos: List of educational videos with titles and links
-        - Articles: List of articles and guides with titles and links  
-        - Exercises: List of practice exercises with titles and links"""
-    )
-
-def create_quiz_task(topic: str):
-    return Task(
-        description=f"""Create a quiz about '{topic}' with 3 multiple-choice questions. 
-        Make sure the questions are educational and test important concepts.
-        
-        Each question should have:
-        - A clear question
-        - 4 multiple choice options (A, B, C, D)
-        - The correct answer indicated
-        
-        Focus on testing understanding rather than memorization.""",
-        agent=quiz_agent,
-        expected_output=f"""A set of 3 quality multiple-choice questions about {topic}, each with:
-        - Question text
-        - 4 answer options
-        - Correct answer identified"""
-    )
-
-def create_project_task(topic: str, level: str):
-    return Task(
-        description=f"""Suggest 3 practical project ideas about '{topic}' suitable for {level} level learners. 
-        Each project should have a clear title and detailed description.
-        
-        Consider the {level} skill level when designing projects:
-        - Beginner: Simple, guided projects with clear steps
-        - Intermediate: Projects requiring some independent thinking
-        - Advanced: Complex projects requiring expertise and creativity
-        
-        Each project should be practical and help reinforce learning.""",
-        agent=project_agent,
-        expected_output=f"""3 practical project ideas for {level} level learners about {topic}, each with:
-        - Project title
-        - Detailed description
-        - Why it's suitable for {level} level"""
-    )
-
 # Execution function
 def generate_learning_path(topic: str, level: str):
     """Generate a complete learning path for the given topic and level."""
@@ -278,14 +208,13 @@ def run_quiz(quiz_questions, user_name="User"):
     st.subheader("📝 Interactive Quiz")
     if "quiz_score" not in st.session_state:
         st.session_state.quiz_score = 0
-    if "quiz_answers" not in st.session_state or len(st.session_state.quiz_answers) != len(quiz_questions):
-        st.session_state.quiz_answers = [None] * len(quiz_questions)
     if "quiz_submitted" not in st.session_state:
         st.session_state.quiz_submitted = False
 
     for i, q in enumerate(quiz_questions):
         st.markdown(f"**Q{i+1}: {q['question']}**")
-        st.session_state.quiz_answers[i] = st.radio(
+        # Streamlit persists each answer under its widget key
+        st.radio(
             f"Choose your answer for Q{i+1}:",
             q["options"],
             key=f"quiz_{i}"
@@ -297,7 +226,7 @@ def run_quiz(quiz_questions, user_name="User"):
         score = 0
         results = []
         for i, q in enumerate(quiz_questions):
-            user_ans = st.session_state.quiz_answers[i]
+            user_ans = st.session_state.get(f"quiz_{i}")
             correct = user_ans == q["answer"]
             results.append({
                 "Question": q["question"],
@@ -320,8 +249,9 @@ def run_quiz(quiz_questions, user_name="User"):
             "results": results
         }
         try:
-            with open("quiz_results.json", "a") as f:
-                f.write(json.dumps(quiz_record) + "\n")
+            quiz_file = get_quiz_results_file()
+            quiz_file.write(orjson.dumps(quiz_record, option=orjson.OPT_APPEND_NEWLINE))
+            quiz_file.flush()
         except Exception as e:
             st.warning(f"Could not save quiz results: {e}")
 
@@ -335,79 +265,28 @@ def run_quiz(quiz_questions, user_name="User"):
             else:
                 st.markdown(f"<div style='color:#b94a48;'><b>Q{i+1}:</b> ❌ Incorrect (0 points)<br> <b>Your Answer:</b> {q['Your Answer']}<br> <b>Correct Answer:</b> {q['Correct Answer']}</div>", unsafe_allow_html=True)
             st.markdown("---")
-        df = pd.DataFrame(st.session_state.quiz_results)
-        st.dataframe(df, use_container_width=True)
+        st.table(st.session_state.quiz_results)
         # Download as CSV
-        csv = df.to_csv(index=False).encode('utf-8')
+        csv_bytes = results_to_csv(st.session_state.quiz_results)
         st.download_button(
             label="Download Quiz Results as CSV",
-            data=csv,
+            data=csv_bytes,
             file_name="quiz_results.csv",
             mime="text/csv"
         )
 
 # Streamlit UI
+@st.cache_resource
+def load_css() -> str:
+    """Read the app stylesheet once per process."""
+    with open(os.path.join(os.path.dirname(__file__), "static", "learning_pro.css")) as f:
+        return f.read()
+
 def main():
     st.set_page_config(page_title="Personalized Learning Assistant Pro", page_icon="🎓", layout="wide")
 
     # ===== Custom CSS for Professional Look =====
-    custom_css = """
-    <style>
-    body, .stApp {
-        background: linear-gradient(120deg, #f6f7fb 0%, #e3eafc 100%);
-        color: #222831;
-    }
-    [data-testid="stSidebar"] {
-        background: #1b263b;
-        color: #f6f7fb;
-    }
-    .st-emotion-cache-10trblm {
-        color: #4361ee;
-        font-weight: 800;
-        letter-spacing: 1px;
-    }
-    .stButton > button {
-        background: linear-gradient(90deg, #4361ee 0%, #48cae4 100%);
-        color: white;
-        border: none;
-        border-radius: 8px;
-        font-weight: 600;
-        padding: 0.5em 2em;
-        margin-top: 1em;
-        transition: background 0.3s;
-    }
-    .stButton > button:hover {
-        background: linear-gradient(90deg, #48cae4 0%, #4361ee 100%);
-    }
-    .st-expanderHeader {
-        background: #e3eafc;
-        color: #4361ee;
-        font-weight: 600;
-        border-radius: 6px;
-    }
-    .stAlert {
-        border-radius: 8px;
-    }
-    .card {
-        background: #f6f7fb;
-        border-radius: 18px;
-        box-shadow: 0 2px 12px rgba(44, 62, 80, 0.07);
-        padding: 2.5rem 2.5rem 1.5rem 2.5rem;
-        min-width: 350px;
-        max-width: 480px;
-        width: 100%;
-        margin: 0 auto 1.5rem auto;
-    }
-    .result-box {
-        background: #eafbe7;
-        border-left: 6px solid #43aa8b;
-        border-radius: 12px;
-        padding: 22px;
-        margin-bottom: 16px;
-    }
-    </style>
-    """
-    st.markdown(custom_css, unsafe_allow_html=True)
+    st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
 
     with st.sidebar:
         st.image(
@@ -427,7 +306,7 @@ def main():
         st.markdown("---")
         st.info("1. Enter your topic and level.\n2. Click 'Generate Learning Path'.\n3. Explore your personalized plan!", icon="📝")
         st.markdown("---")
-        st.caption("Powered by Gemini + CrewAI")
+        st.caption("Powered by Gemini + Serper")
 
     st.title("Personalized Learning Assistant Pro 🎓")
     st.markdown(
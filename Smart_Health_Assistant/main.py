@@ -1,76 +1,40 @@
 import streamlit as st
-from autogen import AssistantAgent, UserProxyAgent, GroupChat, GroupChatManager
-import google.generativeai as genai
 import os
+import requests
+import string
+from typing import Optional
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from diskcache import Cache
 from dotenv import load_dotenv
 
 # ===== Custom CSS for Professional Look =====
-custom_css = """
-<style>
-body, .stApp {
-    background: linear-gradient(120deg, #f6f7fb 0%, #e3eafc 100%);
-    color: #222831;
-}
-[data-testid="stSidebar"] {
-    background: #1b263b;
-    color: #f6f7fb;
-}
-.st-emotion-cache-10trblm {
-    color: #4361ee;
-    font-weight: 800;
-    letter-spacing: 1px;
-}
-.stButton > button {
-    background: linear-gradient(90deg, #4361ee 0%, #48cae4 100%);
-    color: white;
-    border: none;
-    border-radius: 8px;
-    font-weight: 600;
-    padding: 0.5em 2em;
-    margin-top: 1em;
-    transition: background 0.3s;
-}
-.stButton > button:hover {
-    background: linear-gradient(90deg, #48cae4 0%, #4361ee 100%);
-}
-.st-expanderHeader {
-    background: #e3eafc;
-    color: #4361ee;
-    font-weight: 600;
-    border-radius: 6px;
-}
-.stAlert {
-    border-radius: 8px;
-}
-.card {
-    background: #f6f7fb;
-    border-radius: 18px;
-    box-shadow: 0 2px 12px rgba(44, 62, 80, 0.07);
-    padding: 2.5rem 2.5rem 1.5rem 2.5rem;
-    min-width: 350px;
-    max-width: 480px;
-    width: 100%;
-    margin: 0 auto 1.5rem auto;
-}
-.result-box {
-    background: #eafbe7;
-    border-left: 6px solid #43aa8b;
-    border-radius: 12px;
-    padding: 22px;
-    margin-bottom: 16px;
-}
-</style>
-"""
-st.markdown(custom_css, unsafe_allow_html=True)
+@st.cache_resource
+def load_css() -> str:
+    with open(os.path.join(os.path.dirname(__file__), "static", "health_pro.css")) as f:
+        return f.read()
+
+st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
+
+HERO_IMAGE_URL = "https://images.unsplash.com/photo-1519864600265-abb23847ef2c?auto=format&fit=crop&w=400&q=80"
+
+@st.cache_data(ttl=86400, show_spinner=False)
+def get_hero_image() -> Optional[bytes]:
+    """Fetch the sidebar image once a day instead of having every browser load it from Unsplash.
+    Returns None if the fetch fails; st.cache_data doesn't cache exceptions, so returning
+    keeps an offline server from retrying the request on every rerun."""
+    try:
+        response = requests.get(HERO_IMAGE_URL, timeout=5)
+        response.raise_for_status()
+    except requests.RequestException:
+        return None
+    return response.content
 
 # ===== Streamlit UI (Redesigned) =====
 st.set_page_config(page_title="Smart Health Assistant Pro", layout="wide", page_icon="🩺")
 
 with st.sidebar:
-    st.image(
-        "https://images.unsplash.com/photo-1519864600265-abb23847ef2c?auto=format&fit=crop&w=400&q=80",
-        use_column_width=True,
-    )
+    # Without cached bytes the browser loads the image from Unsplash itself
+    st.image(get_hero_image() or HERO_IMAGE_URL, use_column_width=True)
     st.title("🩺 Health Assistant Pro")
     st.markdown(
         """
@@ -84,7 +48,7 @@ with st.sidebar:
     st.markdown("---")
     st.info("1. Enter your health details.\n2. Click 'Generate Health Plan'.\n3. View your personalized plan!", icon="📝")
     st.markdown("---")
-    st.caption("Powered by Gemini + Autogen")
+    st.caption("Powered by Gemini")
 
 st.title("Smart Health Assistant Pro 🩺")
 st.markdown(
@@ -105,166 +69,225 @@ if "final_plan" not in st.session_state:
 if "messages" not in st.session_state:
     st.session_state.messages = []
 
-# === Utility: Gemini Config Wrapper ===
-def get_gemini_config(api_key: str, model: str = "gemini-1.5-flash"):
-    return [{
-        "model": model,
-        "api_key": api_key,
-        "api_type": "google",
-        "base_url": "https://generativelanguage.googleapis.com/v1beta"
-    }]
+# === Health Plan Prompts ===
+# One specialist per plan section. Kept free of per-user fields so each prompt prefix is
+# identical across requests; the user's profile travels in the request message instead.
+# Both sections only need the precomputed BMI, so they are generated in parallel.
+PLAN_SYSTEM_MESSAGES = {
+    "diet_plan": """You are a nutritionist.
+The user's BMI and BMI category are precomputed in the user profile.
+Create a meal plan based on the BMI category and the dietary preference from the user
+profile. Include breakfast, lunch, dinner, and snacks with portions.
+Write the plan in markdown.""",
+    "workout_plan": """You are a fitness trainer.
+The user's BMI and BMI category are precomputed in the user profile.
+Create a weekly workout plan based on age, gender and the BMI category.
+Include cardio, strength training with duration and intensity.
+Write the plan in markdown.""",
+}
+
+# Per-request user profile; the instructions live in the static system prompts above,
+# so only these fields vary between requests
+PROFILE_TEMPLATE = string.Template("""User Health Profile:
+- Basic Information:
+  • Weight: $weight kg
+  • Height: $height cm
+  • Age: $age
+  • Gender: $gender
+  • BMI: $bmi ($category)
+- Preferences:
+  • Dietary Preference: $dietary_preference
+""")
+
+# Plan sections in display order, labelled with the specialist that used to produce them
+PLAN_SECTIONS = [
+    ("Diet_Planner", "diet_plan"),
+    ("Workout_Scheduler", "workout_plan"),
+]
+
+# Hedged requests: if a section has not arrived after PLAN_HEDGE_DELAY seconds, send a duplicate
+# request (up to PLAN_HEDGE_ATTEMPTS in flight) and keep whichever completes first
+PLAN_HEDGE_ATTEMPTS = 3
+PLAN_HEDGE_DELAY = 10  # seconds
+
+# === Health Plan Cache ===
+HEALTH_CACHE_TTL = 30 * 24 * 60 * 60  # 30 days
+
+@st.cache_resource
+def get_plan_cache():
+    # Next to this file rather than in whatever directory Streamlit was started from
+    return Cache(os.path.join(os.path.dirname(__file__), ".health_cache"))
+
+def plan_bucket(bmi: float, gender: str, age: int, dietary_preference: str):
+    """Group similar profiles so repeat buckets reuse an already generated plan.
+    Buckets never span two BMI categories, since each plan is written for one."""
+    return (bmi_category(bmi), round(bmi), gender, age // 10 * 10, dietary_preference)
 
 # === BMI Tool ===
 def calculate_bmi(weight_kg: float, height_cm: float) -> float:
     height_m = height_cm / 100
     return round(weight_kg / (height_m ** 2), 1)
 
-# === Health Form (Redesigned Card) ===
-st.markdown("<div class='card'>", unsafe_allow_html=True)
-with st.form("health_form"):
-    st.markdown("<h3 style='margin-bottom: 1.2rem;'>📝 Enter Your Health Details</h3>", unsafe_allow_html=True)
-    col1, col2 = st.columns(2, gap="large")
-    with col1:
-        weight = st.number_input("Weight (kg)", min_value=30.0, max_value=200.0, value=70.0, step=0.1, format="%.1f")
-        height = st.number_input("Height (cm)", min_value=100, max_value=250, value=170)
-        age = st.number_input("Age", min_value=18, max_value=100, value=30)
-    with col2:
-        gender = st.selectbox("Gender", ["Male", "Female", "Other"])
-        dietary_preference = st.selectbox("Dietary Preference", ["Veg", "Non-Veg", "Vegan"])
-        st.markdown("<div style='height:28px'></div>", unsafe_allow_html=True)
-        submit_btn = st.form_submit_button("Generate Health Plan")
-st.markdown("</div>", unsafe_allow_html=True)
-
-# === Agent Initialization ===
-def init_agents(api_key):
-    genai.configure(api_key=api_key)
-    config_list = get_gemini_config(api_key)
-
-    bmi_agent = AssistantAgent(
-        name="BMI_Agent",
-        llm_config={"config_list": config_list, "cache_seed": None},
-        system_message="""You are a BMI specialist. Analyze BMI results and:
-        1. Calculate BMI from weight (kg) and height (cm)
-        2. Categorize (underweight, normal, overweight, obese)
-        3. Provide health recommendations
-        Always include the exact BMI value in your response."""
-    )
+def bmi_category(bmi: float) -> str:
+    if bmi < 18.5:
+        return "underweight"
+    if bmi < 25:
+        return "normal"
+    if bmi < 30:
+        return "overweight"
+    return "obese"
 
-    diet_agent = AssistantAgent(
-        name="Diet_Planner",
-        llm_config={"config_list": config_list, "cache_seed": None},
-        system_message=f"""You are a nutritionist. Create meal plans based on:
-        1. BMI analysis from BMI_Agent
-        2. Dietary preference ({dietary_preference})
-        Include breakfast, lunch, dinner, and snacks with portions."""
-    )
+# === Gemini Model ===
+@st.cache_resource
+def get_plan_model(api_key, section: str):
+    # Imported lazily so Streamlit reruns don't pay for the Gemini SDK import
+    import google.generativeai as genai
 
-    workout_agent = AssistantAgent(
-        name="Workout_Scheduler",
-        llm_config={"config_list": config_list, "cache_seed": None},
-        system_message=f"""You are a fitness trainer. Create weekly workout plans based on:
-        1. Age ({age}) and gender ({gender})
-        2. BMI recommendations
-        3. Meal plan from Diet_Planner
-        Include cardio, strength training with duration and intensity."""
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(
+        "gemini-1.5-flash",
+        system_instruction=PLAN_SYSTEM_MESSAGES[section],
     )
 
-    user_proxy = UserProxyAgent(
-        name="User_Proxy",
-        human_input_mode="NEVER",
-        code_execution_config=False,
-        llm_config={"config_list": config_list, "cache_seed": None},
-        system_message="Collects and shares user data with other agents."
-    )
+def request_plan_section(model, request_message: str) -> str:
+    response = model.generate_content(request_message)
+    return response.text
 
-    user_proxy.register_function(function_map={"calculate_bmi": calculate_bmi})
+def generate_plan_section(model, section: str, request_message: str) -> str:
+    """Produce one plan section, hedged against slow responses by racing
+    up to PLAN_HEDGE_ATTEMPTS duplicate requests."""
+    pool = ThreadPoolExecutor(max_workers=PLAN_HEDGE_ATTEMPTS)
+    pending = set()
+    attempts = 0
+    error = None
+    try:
+        while True:
+            if attempts < PLAN_HEDGE_ATTEMPTS:
+                pending.add(pool.submit(request_plan_section, model, request_message))
+                attempts += 1
+            elif not pending:
+                raise error or RuntimeError(f"Gemini returned an empty {section}")
+            done, pending = wait(pending, timeout=PLAN_HEDGE_DELAY, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                content = future.result()
+                if content.strip():
+                    return content
+    finally:
+        # Stragglers can't be interrupted mid-request; their results are simply discarded
+        pool.shutdown(wait=False, cancel_futures=True)
 
-    return user_proxy, bmi_agent, diet_agent, workout_agent, config_list
+def generate_health_plan(api_key, request_message: str):
+    """Generate the diet and workout sections concurrently; wall time is the slower of the two."""
+    # Models come from st.cache_resource, which needs the script thread's context,
+    # so they are resolved here and handed to the workers
+    models = {key: get_plan_model(api_key, key) for _, key in PLAN_SECTIONS}
+    with ThreadPoolExecutor(max_workers=len(PLAN_SECTIONS)) as pool:
+        futures = [
+            (name, pool.submit(generate_plan_section, models[key], key, request_message))
+            for name, key in PLAN_SECTIONS
+        ]
+        return [(name, future.result()) for name, future in futures]
 
-# === Submit Handler ===
-if submit_btn and default_api_key:
-    try:
-        user_proxy, bmi_agent, diet_agent, workout_agent, config_list = init_agents(default_api_key)
+def generate_plan(weight, height, age, gender, dietary_preference):
+    """Build the plan sections for one set of form inputs; returns [(name, content)].
+    Not memoized here: the on-disk bucket cache is checked first and already answers
+    every repeat of a successfully generated plan."""
+    bmi = calculate_bmi(weight, height)
+    category = bmi_category(bmi)
+    request_message = PROFILE_TEMPLATE.substitute(
+        weight=weight,
+        height=height,
+        age=age,
+        gender=gender,
+        bmi=bmi,
+        category=category,
+        dietary_preference=dietary_preference,
+    )
 
-        groupchat = GroupChat(
-            agents=[user_proxy, bmi_agent, diet_agent, workout_agent],
-            messages=[],
-            max_round=6,
-            speaker_selection_method="round_robin"
-        )
+    return [
+        (name, content)
+        for name, content in generate_health_plan(default_api_key, request_message)
+        if content.strip()
+    ]
 
-        manager = GroupChatManager(
-            groupchat=groupchat,
-            llm_config={"config_list": config_list, "cache_seed": None}
-        )
+# === Health Plan Fragment ===
+# Form submissions rerun only this fragment, so the page chrome above stays mounted
+@st.experimental_fragment
+def health_plan_fragment():
+    # === Health Form (Redesigned Card) ===
+    st.markdown("<div class='card'>", unsafe_allow_html=True)
+    with st.form("health_form"):
+        st.markdown("<h3 style='margin-bottom: 1.2rem;'>📝 Enter Your Health Details</h3>", unsafe_allow_html=True)
+        col1, col2 = st.columns(2, gap="large")
+        with col1:
+            weight = st.number_input("Weight (kg)", min_value=30.0, max_value=200.0, value=70.0, step=0.1, format="%.1f")
+            height = st.number_input("Height (cm)", min_value=100, max_value=250, value=170)
+            age = st.number_input("Age", min_value=18, max_value=100, value=30)
+        with col2:
+            gender = st.selectbox("Gender", ["Male", "Female", "Other"])
+            dietary_preference = st.selectbox("Dietary Preference", ["Veg", "Non-Veg", "Vegan"])
+            st.markdown("<div style='height:28px'></div>", unsafe_allow_html=True)
+            submit_btn = st.form_submit_button("Generate Health Plan")
+    st.markdown("</div>", unsafe_allow_html=True)
 
-        initial_message = f"""
-        User Health Profile:
-        - Basic Information:
-          • Weight: {weight} kg
-          • Height: {height} cm
-          • Age: {age}
-          • Gender: {gender}
-        - Preferences:
-          • Dietary Preference: {dietary_preference}
-
-        Please proceed with the health assessment in this sequence:
-        1. Calculate BMI using the 'calculate_bmi' function with weight={weight} and height={height}
-        2. Analyze BMI and provide recommendations
-        3. Create a meal plan based on BMI analysis and dietary preference
-        4. Develop a workout schedule based on age, gender, and meal plan
-        """
+    # === Submit Handler ===
+    if submit_btn and default_api_key:
+        try:
+            bmi = calculate_bmi(weight, height)
+            bucket = plan_bucket(bmi, gender, int(age), dietary_preference)
+            plan_cache = get_plan_cache()
+            sections = plan_cache.get(bucket)
 
-        with st.spinner("Generating your personalized health plan..."):
-            user_proxy.initiate_chat(
-                manager,
-                message=initial_message,
-                clear_history=True
-            )
+            if sections is None:
+                with st.spinner("Generating your personalized health plan..."):
+                    sections = generate_plan(weight, height, age, gender, dietary_preference)
+                if dict(sections).get("Workout_Scheduler"):
+                    plan_cache.set(bucket, sections, expire=HEALTH_CACHE_TTL)
 
-            st.session_state.conversation = []
-            for msg in groupchat.messages:
-                if msg['role'] != 'system' and msg['content'].strip():
-                    st.session_state.conversation.append((msg['name'], msg['content']))
-                    if msg['name'] == "Workout_Scheduler":
-                        st.session_state.final_plan = msg['content']
+            # Only the plan sections are shared within a bucket; the BMI line is always this user's
+            st.session_state.conversation = [("BMI_Calculator", f"**BMI:** {bmi} ({bmi_category(bmi)})")] + sections
+            st.session_state.final_plan = dict(sections).get("Workout_Scheduler", "")
+            st.success("Health plan generated successfully! ✅")
 
-        st.success("Health plan generated successfully! ✅")
+        except Exception as e:
+            st.markdown(f"<div style='color:#b94a48; background:#f8d7da; border-radius:8px; padding:0.8rem 1rem; margin-bottom:0.5rem;'><b>Error occurred:</b> {str(e)}</div>", unsafe_allow_html=True)
+            st.markdown("<div style='color:#555; background:#e2e3e5; border-radius:8px; padding:0.8rem 1rem;'><b>Please ensure:</b> 1) Valid API key in .env 2) Stable internet connection 3) Correct input values</div>", unsafe_allow_html=True)
 
-    except Exception as e:
-        st.markdown(f"<div style='color:#b94a48; background:#f8d7da; border-radius:8px; padding:0.8rem 1rem; margin-bottom:0.5rem;'><b>Error occurred:</b> {str(e)}</div>", unsafe_allow_html=True)
-        st.markdown("<div style='color:#555; background:#e2e3e5; border-radius:8px; padding:0.8rem 1rem;'><b>Please ensure:</b> 1) Valid API key in .env 2) Stable internet connection 3) Correct input values</div>", unsafe_allow_html=True)
+    # === Results Display (Redesigned) ===
+    if st.session_state.conversation:
+        st.markdown("---")
+        st.markdown("### Health Plan Generation Process")
 
-# === Results Display (Redesigned) ===
-if st.session_state.conversation:
-    st.markdown("---")
-    st.markdown("### Health Plan Generation Process")
+        for agent, message in st.session_state.conversation:
+            with st.expander(f"{agent} says:"):
+                st.markdown(message)
 
-    for agent, message in st.session_state.conversation:
-        with st.expander(f"{agent} says:"):
-            st.markdown(message)
+        st.markdown("---")
+        st.markdown("## 🌟 Your Complete Health Plan")
 
-    st.markdown("---")
-    st.markdown("## 🌟 Your Complete Health Plan")
-
-    if st.session_state.final_plan:
-        st.markdown(f"<div class='result-box'>{st.session_state.final_plan}</div>", unsafe_allow_html=True)
-        st.download_button(
-            label="⬇️ Download Health Plan",
-            data=st.session_state.final_plan,
-            file_name="personalized_health_plan.txt",
-            mime="text/plain"
+        if st.session_state.final_plan:
+            st.markdown(f"<div class='result-box'>{st.session_state.final_plan}</div>", unsafe_allow_html=True)
+            st.download_button(
+                label="⬇️ Download Health Plan",
+                data=st.session_state.final_plan,
+                file_name="personalized_health_plan.txt",
+                mime="text/plain"
+            )
+        else:
+            st.warning("Workout schedule not generated. Please try again.")
+
+    elif not submit_btn:
+        st.markdown("---")
+        st.info(
+            """
+            **Instructions:**
+            1. Fill in your health details
+            2. Click **Generate Health Plan**
+            3. View your personalized recommendations
+            """
         )
-    else:
-        st.warning("Workout schedule not generated. Please try again.")
 
-elif not submit_btn:
-    st.markdown("---")
-    st.info(
-        """
-        **Instructions:**
-        1. Fill in your health details
-        2. Click **Generate Health Plan**
-        3. View your personalized recommendations
-        """
-    )
\ No newline at end of file
+health_plan_fragment()